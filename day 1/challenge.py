@@ -1,10 +1,20 @@
 import sys
 import re
+import os
+import mmap
+from concurrent.futures import ProcessPoolExecutor
 
 
 INS_RE = re.compile(r'^\s*([LR])\s*([0-9]+)\s*$', re.IGNORECASE)
+TOKEN_RE = re.compile(rb'[^,\s]+')
+SEP_RE = re.compile(rb'[,\s]')
+BYTES_INS_RE = re.compile(rb'([LR])([0-9]+)', re.IGNORECASE)
 
-def compute_final(instructions, start=50):
+def compute_final(instructions, start=50, vectorized=False):
+    if vectorized:
+        deltas = parse_deltas_numpy(_join_instructions(instructions))
+        if deltas is not None:
+            return final_position_numpy(deltas, start)
     pos = start % 100
     for line in instructions:
         line = line.strip()
@@ -25,7 +35,11 @@ def compute_final(instructions, start=50):
     return pos
 
 
-def compute_final_and_count_zero(instructions, start=50):
+def compute_final_and_count_zero(instructions, start=50, vectorized=False):
+    if vectorized:
+        deltas = parse_deltas_numpy(_join_instructions(instructions))
+        if deltas is not None:
+            return count_zero_numpy(deltas, start)
     pos = start % 100
     zero_count = 0
     for line in instructions:
@@ -56,6 +70,172 @@ def compute_final_and_count_zero(instructions, start=50):
                 pos = (pos + val) % 100
     return pos, zero_count
 
+
+# Vectorised backend. The parser only accepts plain ASCII "<L|R><digits>" tokens
+# separated by whitespace/commas and returns None for anything else, so callers
+# can fall back to the reference functions above for exact error reporting.
+MAX_DIGITS = 18
+
+
+def _join_instructions(instructions):
+    return '\n'.join(instructions).encode('utf-8')
+
+
+def parse_deltas_numpy(data):
+    import numpy as np
+
+    buf = np.frombuffer(data, dtype=np.uint8)
+    if buf.size == 0:
+        return np.zeros(0, dtype=np.int64)
+    upper = buf & 0xDF
+    is_left = upper == ord('L')
+    is_letter = is_left | (upper == ord('R'))
+    is_digit = (buf >= ord('0')) & (buf <= ord('9'))
+    is_sep = np.isin(buf, np.frombuffer(b' \t\n\r\f\v,', dtype=np.uint8))
+    if not np.all(is_letter | is_digit | is_sep):
+        return None
+
+    # every digit follows a letter or digit, every letter follows a separator
+    # (or the start of the buffer) and is followed by a digit
+    if np.any(is_digit[1:] & ~(is_letter[:-1] | is_digit[:-1])) or is_digit[0]:
+        return None
+    if np.any(is_letter[1:] & ~is_sep[:-1]):
+        return None
+    letters = np.flatnonzero(is_letter)
+    nxt = letters + 1
+    padded_digit = np.append(is_digit, False)
+    if not np.all(padded_digit[nxt]):
+        return None
+
+    values = np.zeros(letters.size, dtype=np.int64)
+    active = np.ones(letters.size, dtype=bool)
+    padded = np.append(buf, np.uint8(0))
+    for k in range(MAX_DIGITS + 1):
+        idx = np.minimum(nxt + k, buf.size)
+        active &= padded_digit[idx]
+        if not active.any():
+            break
+        if k == MAX_DIGITS:
+            return None
+        values = np.where(active, values * 10 + (padded[idx].astype(np.int64) - ord('0')), values)
+
+    return np.where(is_left[letters], -values, values)
+
+
+def final_position_numpy(deltas, start=50):
+    import numpy as np
+
+    return int((start % 100 + np.sum(deltas % 100)) % 100)
+
+
+def count_zero_numpy(deltas, start=50):
+    import numpy as np
+
+    if deltas.size == 0:
+        return start % 100, 0
+    steps = deltas % 100
+    after = (start % 100 + np.cumsum(steps)) % 100
+    before = np.empty_like(after)
+    before[0] = start % 100
+    before[1:] = after[:-1]
+    val = np.abs(deltas)
+    # moving right from p clicks past zero (p + v) // 100 times; moving left is the
+    # same walk mirrored, starting from (100 - p) % 100
+    from_zero = np.where(deltas < 0, (100 - before) % 100, before)
+    hits = (from_zero + val) // 100
+    # each element fits in int64 but the total may not, so only trust the
+    # native sum when it provably cannot wrap
+    if int(hits.max()) * hits.size < 2 ** 63:
+        zero_count = int(np.sum(hits))
+    else:
+        zero_count = sum(map(int, hits))
+    return int(after[-1]), zero_count
+
+
+# A block of instructions shifts every start position by the same offset, so it
+# is summarised by (offset, hits) where hits[s] is the number of zero clicks when
+# the block is entered at dial position s.
+def _add_circular(diff, a, length):
+    end = a + length
+    diff[a] += 1
+    if end <= 100:
+        diff[end] -= 1
+    else:
+        diff[100] -= 1
+        diff[0] += 1
+        diff[end - 100] -= 1
+
+
+def build_chunk_table(data):
+    offset = 0
+    base = 0
+    diff = [0] * 101
+    for m in TOKEN_RE.finditer(data):
+        token = m.group()
+        im = BYTES_INS_RE.fullmatch(token)
+        if not im:
+            raise ValueError(f"Invalid instruction: {token.decode(errors='replace')!r}")
+        val = int(im.group(2))
+        base += val // 100
+        r = val % 100
+        if im.group(1) in b'Ll':
+            if r:
+                _add_circular(diff, (1 - offset) % 100, r)
+            offset = (offset - val) % 100
+        else:
+            if r:
+                _add_circular(diff, (100 - r - offset) % 100, r)
+            offset = (offset + val) % 100
+    hits = []
+    running = base
+    for s in range(100):
+        running += diff[s]
+        hits.append(running)
+    return offset, hits
+
+
+def compose_tables(first, second):
+    off_a, hits_a = first
+    off_b, hits_b = second
+    hits = [hits_a[s] + hits_b[(s + off_a) % 100] for s in range(100)]
+    return (off_a + off_b) % 100, hits
+
+
+def _table_for_byte_range(args):
+    path, start, end = args
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        size = len(mm)
+        # a token belongs to the chunk its first byte falls in
+        if start > 0 and not SEP_RE.match(mm, start - 1):
+            m = SEP_RE.search(mm, start)
+            start = m.start() if m else size
+        if end < size and not SEP_RE.match(mm, end - 1):
+            m = SEP_RE.search(mm, end)
+            end = m.start() if m else size
+        data = mm[start:end] if start < end else b''
+    return build_chunk_table(data)
+
+
+def compute_final_and_count_zero_parallel(path, start=50, workers=None, chunk_size=None):
+    size = os.path.getsize(path)
+    workers = workers or os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1 << 20, -(-size // (workers * 4)))
+    bounds = [(path, lo, min(lo + chunk_size, size)) for lo in range(0, size, chunk_size)]
+
+    table = (0, [0] * 100)
+    if len(bounds) > 1 and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for chunk in pool.map(_table_for_byte_range, bounds):
+                table = compose_tables(table, chunk)
+    else:
+        for args in bounds:
+            table = compose_tables(table, _table_for_byte_range(args))
+
+    pos = start % 100
+    offset, hits = table
+    return (pos + offset) % 100, hits[pos]
+
 def read_lines_from_stdin():
     return sys.stdin.read().splitlines()
 
@@ -64,9 +244,23 @@ def read_lines_from_file(path):
         return f.read().splitlines()
 
 if __name__ == '__main__':
-    if len(sys.argv) > 1:
-        lines = read_lines_from_file(sys.argv[1])
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    flags = {a for a in sys.argv[1:] if a.startswith('--')}
+    if '--numpy' in flags and args:
+        with open(args[0], 'rb') as f:
+            deltas = parse_deltas_numpy(f.read())
+        if deltas is None:
+            final_pos, zero_count = compute_final_and_count_zero(read_lines_from_file(args[0]), start=50)
+        else:
+            final_pos, zero_count = count_zero_numpy(deltas, start=50)
+    elif '--parallel' in flags:
+        if not args:
+            raise SystemExit("--parallel needs an input file path")
+        final_pos, zero_count = compute_final_and_count_zero_parallel(args[0], start=50)
     else:
-        lines = read_lines_from_stdin()
-    final_pos, zero_count = compute_final_and_count_zero(lines, start=50)
+        if args:
+            lines = read_lines_from_file(args[0])
+        else:
+            lines = read_lines_from_stdin()
+        final_pos, zero_count = compute_final_and_count_zero(lines, start=50, vectorized='--numpy' in flags)
     print(zero_count)
\ No newline at end of file
@@ -1,4 +1,5 @@
 import re
+import sys
 from collections import deque
 from pathlib import Path
 from typing import List, Tuple
@@ -69,6 +70,98 @@ def bfs_solution(pattern: str, buttons: list[list[int]]):
 	raise ValueError("No solution found")
 
 
+def _gray_code_minimum(start: int, vectors: List[int], weight) -> int:
+	"""Walk every XOR combination of vectors from start, tracking the best weight."""
+	value = start
+	best = weight(value)
+	for k in range(1, 1 << len(vectors)):
+		value ^= vectors[(k & -k).bit_length() - 1]
+		best = min(best, weight(value))
+	return best
+
+
+def gf2_solution(pattern: str, buttons: list[list[int]]) -> int:
+	"""Return minimal button presses via Gaussian elimination over GF(2)."""
+	m = len(buttons)
+	target = 0
+	for idx, ch in enumerate(pattern):
+		if ch == "#":
+			target |= 1 << idx
+
+	button_masks = []
+	for toggles in buttons:
+		mask = 0
+		for t in toggles:
+			mask |= 1 << t
+		button_masks.append(mask)
+
+	# one equation per light: bits 0..m-1 pick buttons, bit m is the target
+	n_lights = max([len(pattern)] + [mask.bit_length() for mask in button_masks])
+	rows = []
+	for light in range(n_lights):
+		row = (target >> light & 1) << m
+		for j, mask in enumerate(button_masks):
+			if mask >> light & 1:
+				row |= 1 << j
+		rows.append(row)
+
+	pivots: List[Tuple[int, int]] = []
+	for col in range(m):
+		bit = 1 << col
+		idx = next((k for k, row in enumerate(rows) if row & bit), None)
+		if idx is None:
+			continue
+		pivot = rows.pop(idx)
+		rows = [row ^ pivot if row & bit else row for row in rows]
+		pivots = [(c, row ^ pivot if row & bit else row) for c, row in pivots]
+		pivots.append((col, pivot))
+	if any(rows):
+		raise ValueError("No solution found")
+
+	pivot_cols = {c for c, _ in pivots}
+	particular = 0
+	for col, row in pivots:
+		if row >> m & 1:
+			particular |= 1 << col
+	basis = []
+	for free in range(m):
+		if free in pivot_cols:
+			continue
+		vec = 1 << free
+		for col, row in pivots:
+			if row >> free & 1:
+				vec |= 1 << col
+		basis.append(vec)
+
+	if len(basis) <= m // 2 + 1:
+		return _gray_code_minimum(particular, basis, int.bit_count)
+
+	# large null space: meet in the middle over the buttons themselves
+	half = m // 2
+	left: dict[int, int] = {}
+	state = count = 0
+	left[0] = 0
+	low = button_masks[:half]
+	for k in range(1, 1 << len(low)):
+		bit = (k & -k).bit_length() - 1
+		state ^= low[bit]
+		count += 1 if (k ^ k >> 1) >> bit & 1 else -1
+		if count < left.get(state, m + 1):
+			left[state] = count
+	best = m + 1
+	state = count = 0
+	high = button_masks[half:]
+	for k in range(0, 1 << len(high)):
+		if k:
+			bit = (k & -k).bit_length() - 1
+			state ^= high[bit]
+			count += 1 if (k ^ k >> 1) >> bit & 1 else -1
+		other = left.get(target ^ state)
+		if other is not None:
+			best = min(best, other + count)
+	return best
+
+
 def min_presses_joltage(buttons: List[List[int]], targets: List[int]) -> int:
 	"""Solve min button presses for joltage counters via MILP."""
 	import pulp
@@ -88,6 +181,9 @@ def min_presses_joltage(buttons: List[List[int]], targets: List[int]) -> int:
 
 def main():
 	machines = parse_input("puzzle_input.txt")
+	if "--lights" in sys.argv:
+		print(sum(gf2_solution(pattern, buttons) for pattern, buttons, _ in machines))
+		return
 	total = 0
 	for pattern, buttons, targets in machines:
 		total += min_presses_joltage(buttons, targets)
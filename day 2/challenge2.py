@@ -40,46 +40,138 @@ def main(argv):
 	print(total)
 
 
+def _prime_factors(n: int):
+	primes = []
+	p = 2
+	while p * p <= n:
+		if n % p == 0:
+			primes.append(p)
+			while n % p == 0:
+				n //= p
+		p += 1
+	if n > 1:
+		primes.append(n)
+	return primes
+
+
+def _sum_with_period(a: int, b: int, length: int, k: int) -> int:
+	mult = (10**length - 1) // (10**k - 1)
+	lo = max((a + mult - 1) // mult, 10 ** (k - 1))
+	hi = min(b // mult, 10**k - 1)
+	if lo > hi:
+		return 0
+	return mult * (lo + hi) * (hi - lo + 1) // 2
+
+
+def sum_repeated_any_in_range(a: int, b: int) -> int:
+	total = 0
+	for length in range(max(len(str(a)), 2), len(str(b)) + 1):
+		# a length-L number is a repeat if it has period L/p for some prime p | L;
+		# inclusion-exclusion over those primes is the Mobius sum over divisors
+		primes = _prime_factors(length)
+		for mask in range(1, 1 << len(primes)):
+			div = 1
+			bits = 0
+			for idx, p in enumerate(primes):
+				if mask >> idx & 1:
+					div *= p
+					bits += 1
+			sign = 1 if bits % 2 else -1
+			total += sign * _sum_with_period(a, b, length, length // div)
+	return total
+
+
+def main_part2(argv):
+	fname = 'sample.txt' if len(argv) <= 2 else argv[2]
+	data = open(fname, 'r', encoding='utf-8').read().strip()
+	total2 = 0
+	for a, b in parse_ranges(data):
+		total2 += sum_repeated_any_in_range(a, b)
+	print(total2)
+
+
+def build_repeated_index(path: str, digits: int = 12):
+	import numpy as np
+
+	if not 2 <= digits <= 18:
+		raise ValueError("digits must be between 2 and 18 to fit int64")
+	parts = []
+	for length in range(2, digits + 1):
+		for p in _prime_factors(length):
+			k = length // p
+			mult = (10**length - 1) // (10**k - 1)
+			parts.append(np.arange(10 ** (k - 1), 10**k, dtype=np.int64) * mult)
+	values = np.unique(np.concatenate(parts))
+	# exact prefix sums as two uint64 words: column 0 is the low word (wrapping
+	# cumsum), column 1 counts the wraps. Every value is below 2**63, so each
+	# step wraps at most once.
+	prefix = np.zeros((values.size + 1, 2), dtype=np.uint64)
+	np.cumsum(values.astype(np.uint64), out=prefix[1:, 0])
+	np.cumsum(prefix[1:, 0] < prefix[:-1, 0], out=prefix[1:, 1])
+	np.save(path + '.values.npy', values)
+	np.save(path + '.prefix.npy', prefix)
+
+
+def open_repeated_index(path: str):
+	import numpy as np
+
+	values = np.load(path + '.values.npy', mmap_mode='r')
+	prefix = np.load(path + '.prefix.npy', mmap_mode='r')
+	return values, prefix
+
+
+def query_repeated_index(index, starts, ends):
+	import numpy as np
+
+	values, prefix = index
+	starts = np.asarray(starts, dtype=np.int64)
+	ends = np.asarray(ends, dtype=np.int64)
+	limit = 10 ** len(str(int(values[-1]))) - 1
+	if ends.size and int(ends.max()) > limit:
+		raise ValueError(f"Index only covers values up to {limit}")
+	i = np.searchsorted(values, starts, side='left')
+	j = np.searchsorted(values, ends, side='right')
+	lo_i, lo_j = prefix[i, 0], prefix[j, 0]
+	low = lo_j - lo_i
+	high = prefix[j, 1] - prefix[i, 1] - (lo_j < lo_i)
+
+	total = int(np.sum(high)) << 64
+	total += int(np.sum(low >> np.uint64(32))) * (1 << 32) + int(np.sum(low & np.uint64(0xFFFFFFFF)))
+	# per-range sums stay uint64 unless some range reaches 2**64
+	if high.any():
+		sums = low.astype(object)
+		big = np.flatnonzero(high)
+		sums[big] += high[big].astype(object) << 64
+	else:
+		sums = low
+	return sums, total
+
+
+def parse_ranges_numpy(s: str):
+	import numpy as np
+
+	bounds = [int(x) for a, b in parse_ranges(s) for x in (a, b)]
+	bounds = np.array(bounds, dtype=np.int64)
+	return bounds[0::2], bounds[1::2]
+
+
+def main_index(argv):
+	if len(argv) < 4:
+		print("usage: challenge2.py index-build <path> <digits> | index-query <path> <ranges-file>")
+		return
+	if argv[1] == 'index-build':
+		build_repeated_index(argv[2], int(argv[3]))
+		return
+	index = open_repeated_index(argv[2])
+	data = open(argv[3], 'r', encoding='utf-8').read().strip()
+	starts, ends = parse_ranges_numpy(data)
+	print(query_repeated_index(index, starts, ends)[1])
+
+
 if __name__ == '__main__':
 	if len(sys.argv) > 1 and sys.argv[1] in ('part2', '--part2'):
-		fname = 'sample.txt'
-		data = open(fname, 'r', encoding='utf-8').read().strip()
-		ranges = list(parse_ranges(data))
-
-		max_b = max(b for _, b in ranges)
-
-		nums = set()
-		max_len = len(str(max_b))
-		for k in range(1, max_len + 1):
-			rmax = max_len // k
-			if rmax < 2:
-				continue
-			t_min = 10 ** (k - 1)
-			t_max = 10**k - 1
-			for r in range(2, rmax + 1):
-				mult = (10 ** (k * r) - 1) // (10 ** k - 1)
-				high_t = min(t_max, max_b // mult)
-				if high_t < t_min:
-					continue
-				for t in range(t_min, high_t + 1):
-					n = t * mult
-					if n <= max_b:
-						nums.add(n)
-
-		nums_list = sorted(nums)
-		from bisect import bisect_left, bisect_right
-
-		pref = [0]
-		for v in nums_list:
-			pref.append(pref[-1] + v)
-
-		total2 = 0
-		for a, b in ranges:
-			i = bisect_left(nums_list, a)
-			j = bisect_right(nums_list, b)
-			total2 += pref[j] - pref[i]
-
-		print(total2)
+		main_part2(sys.argv)
+	elif len(sys.argv) > 1 and sys.argv[1] in ('index-build', 'index-query'):
+		main_index(sys.argv)
 	else:
 		main(sys.argv)
-
@@ -1,11 +1,16 @@
 
 
 
+from bisect import bisect_left, insort
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+import mmap
+import os
 import sys
+import time
 
 
-def max_k_subsequence_value(s: str, k: int) -> int:
+def max_k_subsequence_value_reference(s: str, k: int) -> int:
 	s = s.strip()
 	n = len(s)
 	if k <= 0 or n < k:
@@ -36,6 +41,122 @@ def max_k_subsequence_value(s: str, k: int) -> int:
 	return val
 
 
+def max_k_subsequence_value(s: str, k: int) -> int:
+	return max_k_subsequence_bytes(s.strip().encode(), k)
+
+
+def max_k_subsequence_bytes(buf: bytes, k: int) -> int:
+	n = len(buf)
+	if k <= 0 or n < k:
+		return 0
+
+	# keep a non-increasing stack of digit bytes, popping smaller digits while
+	# we can still afford to drop them
+	drop = n - k
+	stack = bytearray()
+	for c in buf:
+		while drop and stack and stack[-1] < c:
+			stack.pop()
+			drop -= 1
+		stack.append(c)
+
+	return digits_to_int(stack[:k])
+
+
+def digits_to_int(buf) -> int:
+	# int() refuses very long digit strings, so split and recombine
+	n = len(buf)
+	if n <= 4000:
+		return int(buf) if n else 0
+	half = n // 2
+	return digits_to_int(buf[:half]) * 10 ** (n - half) + digits_to_int(buf[half:])
+
+
+def removal_order(buf) -> list[int]:
+	# Removing digits one at a time, always the first one smaller than its right
+	# neighbour (else the last), leaves the best k-digit subsequence at every
+	# step. The unbounded stack pass pops in exactly that order, and whatever
+	# survives is non-increasing so it is removed from the end.
+	order = []
+	stack = []
+	for i, c in enumerate(buf):
+		while stack and buf[stack[-1]] < c:
+			order.append(stack.pop())
+		stack.append(i)
+	order.extend(reversed(stack))
+	return order
+
+
+def max_subsequence_values_upto(s: str, max_k: int) -> list[int]:
+	buf = s.strip().encode()
+	n = len(buf)
+	values = [0] * max_k
+	order = removal_order(buf)
+	kept: list[int] = []
+	val = 0
+	# rebuild the answers from k=1 upward by re-inserting digits in reverse
+	# removal order
+	for k in range(1, min(max_k, n) + 1):
+		pos = order[n - k]
+		r = len(kept) - bisect_left(kept, pos)
+		insort(kept, pos)
+		scale = 10**r
+		high, low = divmod(val, scale)
+		val = (high * 10 + buf[pos] - 48) * scale + low
+		values[k - 1] = val
+	return values
+
+
+def totals_for_all_k(input_path: Path, max_k: int) -> list[int]:
+	totals = [0] * max_k
+	with open(input_path, "r") as fh:
+		for line in fh:
+			s = line.strip()
+			if not s:
+				continue
+			for idx, v in enumerate(max_subsequence_values_upto(s, max_k)):
+				totals[idx] += v
+	return totals
+
+
+def _sum_chunk(args):
+	path, start, end, k = args
+	t0 = time.perf_counter()
+	total = 0
+	with open(path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+		size = len(mm)
+		# a line belongs to the chunk it starts in
+		if start > 0 and mm[start - 1] != 10:
+			nl = mm.find(b"\n", start)
+			start = size if nl == -1 else nl + 1
+		if end < size and mm[end - 1] != 10:
+			nl = mm.find(b"\n", end)
+			end = size if nl == -1 else nl + 1
+		pos = start
+		while pos < end:
+			nl = mm.find(b"\n", pos, end)
+			stop = end if nl == -1 else nl
+			line = mm[pos:stop].strip()
+			if line:
+				total += max_k_subsequence_bytes(line, k)
+			pos = stop + 1
+	return total, max(end - start, 0), time.perf_counter() - t0, os.getpid()
+
+
+def run_parallel(input_path: Path, k: int, workers: int | None = None, chunk_size: int = 64 << 20):
+	size = os.path.getsize(input_path)
+	jobs = [(str(input_path), lo, min(lo + chunk_size, size), k) for lo in range(0, size, chunk_size)]
+	total = 0
+	stats: dict[int, list[float]] = {}
+	with ProcessPoolExecutor(max_workers=workers) as pool:
+		for part, nbytes, elapsed, pid in pool.map(_sum_chunk, jobs):
+			total += part
+			entry = stats.setdefault(pid, [0, 0.0])
+			entry[0] += nbytes
+			entry[1] += elapsed
+	return total, stats
+
+
 def main(input_path: Path) -> int:
 	total = 0
 	k = getattr(main, "k_override", 2)
@@ -53,6 +174,19 @@ def main(input_path: Path) -> int:
 if __name__ == "__main__":
 	input_path = Path(__file__).parent / "puzzleinput.txt"
 	k = 2
+	upto = None
+	if "--upto" in sys.argv:
+		idx = sys.argv.index("--upto")
+		upto = int(sys.argv[idx + 1])
+		del sys.argv[idx:idx + 2]
+	chunk_size = 64 << 20
+	if "--chunk-size" in sys.argv:
+		idx = sys.argv.index("--chunk-size")
+		chunk_size = int(sys.argv[idx + 1])
+		del sys.argv[idx:idx + 2]
+	parallel = "--parallel" in sys.argv
+	if parallel:
+		sys.argv.remove("--parallel")
 	if len(sys.argv) > 1:
 		first = sys.argv[1]
 		if first.isdigit():
@@ -69,6 +203,18 @@ if __name__ == "__main__":
 		print(f"Input file not found: {input_path}")
 		sys.exit(1)
 
+	if upto is not None:
+		print(totals_for_all_k(input_path, upto))
+		sys.exit(0)
+
+	if parallel:
+		total, stats = run_parallel(input_path, k, chunk_size=chunk_size)
+		for pid, (nbytes, elapsed) in sorted(stats.items()):
+			rate = nbytes / elapsed / 1e6 if elapsed else 0.0
+			print(f"worker {pid}: {nbytes} bytes in {elapsed:.3f}s ({rate:.1f} MB/s)")
+		print(total)
+		sys.exit(0)
+
 	setattr(main, "k_override", k)
 	main(input_path)
 
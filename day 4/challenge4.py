@@ -37,7 +37,7 @@ def solve_part1(filename):
     return accessible_count
 
 
-def solve_part2(filename):
+def solve_part2_reference(filename):
     with open(filename, 'r') as f:
         grid = [list(line.strip()) for line in f.readlines()]
     
@@ -65,7 +65,185 @@ def solve_part2(filename):
     return total_removed
 
 
+def peel_waves(grid):
+    rows = len(grid)
+    cols = len(grid[0]) if rows else 0
+    width = cols + 2
+    
+    # padded flat layout so neighbours never need bounds checks
+    alive = bytearray((rows + 2) * width)
+    for row in range(rows):
+        base = (row + 1) * width + 1
+        for col, cell in enumerate(grid[row]):
+            if cell == '@':
+                alive[base + col] = 1
+    
+    offsets = (-width - 1, -width, -width + 1, -1, 1, width - 1, width, width + 1)
+    counts = bytearray(len(alive))
+    wave = []
+    for idx in range(len(alive)):
+        if alive[idx]:
+            adjacent = 0
+            for off in offsets:
+                adjacent += alive[idx + off]
+            counts[idx] = adjacent
+            if adjacent < 4:
+                wave.append(idx)
+    
+    wave_sizes = []
+    while wave:
+        for idx in wave:
+            alive[idx] = 0
+        wave_sizes.append(len(wave))
+        
+        # only neighbours of removed rolls can become accessible
+        next_wave = []
+        for idx in wave:
+            for off in offsets:
+                nb = idx + off
+                if alive[nb]:
+                    counts[nb] -= 1
+                    if counts[nb] == 3:
+                        next_wave.append(nb)
+        wave = next_wave
+    
+    return wave_sizes
+
+
+def solve_part2(filename):
+    with open(filename, 'r') as f:
+        grid = [line.strip() for line in f.readlines()]
+    
+    return sum(peel_waves(grid))
+
+
+def load_grid_numpy(filename):
+    import numpy as np
+    
+    with open(filename, 'rb') as f:
+        lines = f.read().split()
+    return (np.frombuffer(b''.join(lines), dtype=np.uint8).reshape(len(lines), -1) == ord('@')).astype(np.uint8)
+
+
+def neighbour_counts_numpy(rolls):
+    import numpy as np
+    
+    rows, cols = rolls.shape
+    padded = np.zeros((rows + 2, cols + 2), dtype=np.uint8)
+    padded[1:-1, 1:-1] = rolls
+    # 3x3 box sum via shifted slices, minus the centre cell
+    counts = np.zeros((rows, cols), dtype=np.uint8)
+    for dr in range(3):
+        for dc in range(3):
+            counts += padded[dr:dr + rows, dc:dc + cols]
+    counts -= rolls
+    return counts
+
+
+def solve_part1_numpy(filename):
+    rolls = load_grid_numpy(filename)
+    counts = neighbour_counts_numpy(rolls)
+    return int(((rolls == 1) & (counts < 4)).sum())
+
+
+def solve_part2_numpy(filename):
+    rolls = load_grid_numpy(filename)
+    total_removed = 0
+    
+    while True:
+        accessible = (rolls == 1) & (neighbour_counts_numpy(rolls) < 4)
+        removed = int(accessible.sum())
+        if not removed:
+            break
+        rolls[accessible] = 0
+        total_removed += removed
+    
+    return total_removed
+
+
+def load_grid_bitset(filename):
+    # column order is irrelevant to the symmetric neighbour test, so each row is
+    # read straight as a binary number
+    table = str.maketrans('@.', '10')
+    rows = []
+    width = None
+    with open(filename, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if width is None:
+                width = len(line)
+            rows.append(int(line.translate(table), 2) if line else 0)
+    return rows, width or 0
+
+
+def accessible_row_bitset(above, row, below, full):
+    inputs = (
+        (above << 1) & full, above, above >> 1,
+        (row << 1) & full, row >> 1,
+        (below << 1) & full, below, below >> 1,
+    )
+    x1, x2, x3, x4, x5, x6, x7, x8 = inputs
+    
+    # carry-save adder tree; only the weight-4 carries matter for "count >= 4"
+    p = x1 ^ x2
+    s1, c1 = p ^ x3, (x1 & x2) | (x3 & p)
+    p = x4 ^ x5
+    s2, c2 = p ^ x6, (x4 & x5) | (x6 & p)
+    s3, c3 = x7 ^ x8, x7 & x8
+    p = s1 ^ s2
+    c4 = (s1 & s2) | (s3 & p)
+    p = c1 ^ c2
+    t, c5 = p ^ c3, (c1 & c2) | (c3 & p)
+    c6 = t & c4
+    return row & ~(c5 | c6)
+
+
+def solve_part1_bitset(filename):
+    rows, width = load_grid_bitset(filename)
+    full = (1 << width) - 1
+    padded = [0] + rows + [0]
+    
+    accessible_count = 0
+    for r in range(1, len(padded) - 1):
+        accessible_count += accessible_row_bitset(padded[r - 1], padded[r], padded[r + 1], full).bit_count()
+    return accessible_count
+
+
+def solve_part2_bitset(filename):
+    rows, width = load_grid_bitset(filename)
+    full = (1 << width) - 1
+    padded = [0] + rows + [0]
+    height = len(padded)
+    
+    total_removed = 0
+    dirty = set(range(1, height - 1))
+    while dirty:
+        removals = []
+        for r in sorted(dirty):
+            mask = accessible_row_bitset(padded[r - 1], padded[r], padded[r + 1], full)
+            if mask:
+                removals.append((r, mask))
+        
+        dirty = set()
+        for r, mask in removals:
+            padded[r] &= ~mask
+            total_removed += mask.bit_count()
+            # only rows next to a change can gain new accessible rolls
+            for nr in (r - 1, r, r + 1):
+                if 0 < nr < height - 1:
+                    dirty.add(nr)
+    
+    return total_removed
+
+
 if __name__ == "__main__":
+    import sys
+    
+    if '--numpy' in sys.argv:
+        solve_part1, solve_part2 = solve_part1_numpy, solve_part2_numpy
+    elif '--bitset' in sys.argv:
+        solve_part1, solve_part2 = solve_part1_bitset, solve_part2_bitset
+    
     result_part1 = solve_part1("puzzle_input.txt")
     print(f"Part 1 - Number of accessible rolls: {result_part1}")
     
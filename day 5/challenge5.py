@@ -1,3 +1,10 @@
+import heapq
+import os
+import tempfile
+from array import array
+from bisect import bisect_left, bisect_right
+
+
 def parse_input(filename):
     with open(filename, 'r') as f:
         lines = f.read().strip().split('\n')
@@ -23,10 +30,11 @@ def is_fresh(ingredient_id, ranges):
 
 def count_fresh_ingredients(filename):
     ranges, ingredient_ids = parse_input(filename)
+    index = IntervalIndex(ranges)
     
     fresh_count = 0
     for ingredient_id in ingredient_ids:
-        if is_fresh(ingredient_id, ranges):
+        if index.contains(ingredient_id):
             fresh_count += 1
     
     return fresh_count
@@ -49,6 +57,132 @@ def merge_ranges(ranges):
     return merged
 
 
+class IntervalIndex:
+    def __init__(self, ranges):
+        merged = merge_ranges(ranges)
+        self.starts = [start for start, _ in merged]
+        self.ends = [end for _, end in merged]
+    
+    def contains(self, ingredient_id):
+        i = bisect_right(self.starts, ingredient_id) - 1
+        return i >= 0 and ingredient_id <= self.ends[i]
+    
+    def query_many(self, ingredient_ids):
+        import numpy as np
+        
+        ids = np.asarray(ingredient_ids, dtype=np.int64)
+        if not self.starts:
+            mask = np.zeros(ids.shape, dtype=bool)
+            return 0, mask
+        starts = np.asarray(self.starts, dtype=np.int64)
+        ends = np.asarray(self.ends, dtype=np.int64)
+        i = np.searchsorted(starts, ids, side='right') - 1
+        mask = (i >= 0) & (ids <= ends[np.maximum(i, 0)])
+        return int(mask.sum()), mask
+
+
+class IntervalStore:
+    # disjoint, non-adjacent ranges kept in sorted blocks of at most 2 * LOAD
+    # entries, with each block's first start cached for bisect
+    LOAD = 256
+    
+    def __init__(self, ranges=()):
+        merged = merge_ranges(list(ranges))
+        self._blocks = [merged[i:i + self.LOAD] for i in range(0, len(merged), self.LOAD)]
+        self._mins = [block[0][0] for block in self._blocks]
+        self.total = sum(end - start + 1 for start, end in merged)
+    
+    def __iter__(self):
+        for block in self._blocks:
+            yield from block
+    
+    def __len__(self):
+        return sum(len(block) for block in self._blocks)
+    
+    def _locate(self, x):
+        # position of the first range whose end is >= x
+        if not self._blocks:
+            return 0, 0
+        bi = max(bisect_right(self._mins, x) - 1, 0)
+        j = bisect_left(self._blocks[bi], x, key=lambda r: r[1])
+        if j == len(self._blocks[bi]) and bi + 1 < len(self._blocks):
+            return bi + 1, 0
+        return bi, j
+    
+    def _take(self, lo, hi):
+        # remove every range meeting [lo, hi]; returns them and the insert point
+        if not self._blocks:
+            self._blocks.append([])
+            self._mins.append(0)
+        bi, j = self._locate(lo)
+        removed = []
+        k, idx = bi, j
+        while k < len(self._blocks):
+            block = self._blocks[k]
+            e = idx
+            while e < len(block) and block[e][0] <= hi:
+                e += 1
+            removed.extend(block[idx:e])
+            if e < len(block):
+                break
+            k += 1
+            idx = 0
+        
+        if k == bi:
+            del self._blocks[bi][j:e]
+        else:
+            del self._blocks[bi][j:]
+            if k < len(self._blocks):
+                del self._blocks[k][:e]
+            del self._blocks[bi + 1:k]
+            del self._mins[bi + 1:k]
+        return removed, bi, j
+    
+    def _put(self, bi, j, pieces):
+        block = self._blocks[bi]
+        block[j:j] = pieces
+        for idx in (bi + 1, bi):
+            if idx >= len(self._blocks):
+                continue
+            block = self._blocks[idx]
+            if not block:
+                del self._blocks[idx]
+                del self._mins[idx]
+                continue
+            self._mins[idx] = block[0][0]
+            if len(block) > 2 * self.LOAD:
+                half = len(block) // 2
+                self._blocks[idx:idx + 1] = [block[:half], block[half:]]
+                self._mins[idx:idx + 1] = [block[0][0], block[half][0]]
+    
+    def add(self, start, end):
+        removed, bi, j = self._take(start - 1, end + 1)
+        if removed:
+            start = min(start, removed[0][0])
+            end = max(end, removed[-1][1])
+        self.total += (end - start + 1) - sum(e - s + 1 for s, e in removed)
+        self._put(bi, j, [(start, end)])
+    
+    def remove(self, start, end):
+        removed, bi, j = self._take(start, end)
+        pieces = []
+        if removed:
+            if removed[0][0] < start:
+                pieces.append((removed[0][0], start - 1))
+            if removed[-1][1] > end:
+                pieces.append((end + 1, removed[-1][1]))
+        self.total -= sum(e - s + 1 for s, e in removed)
+        self.total += sum(e - s + 1 for s, e in pieces)
+        self._put(bi, j, pieces)
+    
+    def contains(self, ingredient_id):
+        if not self._blocks:
+            return False
+        bi, j = self._locate(ingredient_id)
+        block = self._blocks[bi]
+        return j < len(block) and block[j][0] <= ingredient_id
+
+
 def count_all_fresh_ids(filename):
     ranges, _ = parse_input(filename)
     merged = merge_ranges(ranges)
@@ -58,6 +192,101 @@ def count_all_fresh_ids(filename):
     return total_count
 
 
+def _iter_range_lines(filename):
+    with open(filename, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                break
+            start, end = map(int, line.split('-'))
+            yield start, end
+
+
+def _write_run(ranges, tmp_dir):
+    ranges.sort()
+    flat = array('q')
+    for start, end in ranges:
+        flat.append(start)
+        flat.append(end)
+    fd, path = tempfile.mkstemp(suffix='.run', dir=tmp_dir)
+    with os.fdopen(fd, 'wb') as f:
+        flat.tofile(f)
+    return path
+
+
+def _read_run(path, block=8192):
+    with open(path, 'rb') as f:
+        while True:
+            flat = array('q')
+            try:
+                flat.fromfile(f, 2 * block)
+            except EOFError:
+                pass
+            if not flat:
+                return
+            for i in range(0, len(flat), 2):
+                yield flat[i], flat[i + 1]
+
+
+def _merge_runs(paths, output_path):
+    # k-way merge of sorted runs, coalescing on the fly exactly like merge_ranges
+    total_count = 0
+    out = array('q')
+    last = None
+    with open(output_path, 'wb') as f:
+        for start, end in heapq.merge(*(_read_run(path) for path in paths)):
+            if last is not None and start <= last[1] + 1:
+                last[1] = max(last[1], end)
+                continue
+            if last is not None:
+                out.extend(last)
+                total_count += last[1] - last[0] + 1
+                if len(out) >= 16384:
+                    out.tofile(f)
+                    out = array('q')
+            last = [start, end]
+        if last is not None:
+            out.extend(last)
+            total_count += last[1] - last[0] + 1
+        out.tofile(f)
+    return total_count
+
+
+def external_merge_ranges(filename, output_path, run_size=1_000_000, tmp_dir=None, max_fan_in=64):
+    if max_fan_in < 2:
+        raise ValueError("max_fan_in must be at least 2")
+    runs = []
+    try:
+        batch = []
+        for rng in _iter_range_lines(filename):
+            batch.append(rng)
+            if len(batch) >= run_size:
+                runs.append(_write_run(batch, tmp_dir))
+                batch = []
+        if batch:
+            runs.append(_write_run(batch, tmp_dir))
+        
+        # merge in passes so at most max_fan_in runs (and read buffers) are
+        # open at once
+        while len(runs) > max_fan_in:
+            groups = [runs[k:k + max_fan_in] for k in range(0, len(runs), max_fan_in)]
+            for group in groups:
+                fd, path = tempfile.mkstemp(suffix='.run', dir=tmp_dir)
+                os.close(fd)
+                runs.append(path)
+                _merge_runs(group, path)
+                for done in group:
+                    runs.remove(done)
+                    os.remove(done)
+        
+        total_count = _merge_runs(runs, output_path)
+    finally:
+        for path in runs:
+            os.remove(path)
+    
+    return total_count
+
+
 if __name__ == "__main__":
     result1 = count_fresh_ingredients("puzzle_input.txt")
     print(f"Part 1 - Number of fresh ingredient IDs: {result1}")
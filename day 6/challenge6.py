@@ -1,79 +1,138 @@
-def solve_math_worksheet(filename):
-    with open(filename, 'r') as f:
-        lines = f.readlines()
-    
-    lines = [line.rstrip('\n') for line in lines]
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+
+NON_DIGITS = bytes(b for b in range(256) if not 48 <= b <= 57)
+
+
+def product_tree(numbers):
+    # multiplying balanced halves keeps big-int operands similar in size
+    layer = list(numbers)
+    while len(layer) > 1:
+        paired = [layer[i] * layer[i + 1] for i in range(0, len(layer) - 1, 2)]
+        if len(layer) % 2:
+            paired.append(layer[-1])
+        layer = paired
+    return layer[0]
+
+
+def evaluate_problem(numbers, operation):
+    if operation == '*':
+        return product_tree(numbers)
+    if operation == '+':
+        return sum(numbers)
+    return numbers[0]
+
+
+def evaluate_problem_sequential(numbers, operation):
+    result = numbers[0]
+    for num in numbers[1:]:
+        if operation == '+':
+            result += num
+        elif operation == '*':
+            result *= num
+    return result
+
+
+def iter_problems(filename):
+    with open(filename, 'rb') as f:
+        lines = [line.rstrip(b'\r\n') for line in f]
     
     if len(lines) < 4:
         raise ValueError("Expected at least 4 lines in the input")
     
-    number_rows = [lines[i] for i in range(len(lines) - 1)]
-    operator_row = lines[-1]
-    
     max_len = max(len(row) for row in lines)
+    rows = [row.ljust(max_len) for row in lines]
+    blank = b' ' * len(rows)
     
-    number_rows = [row.ljust(max_len) for row in number_rows]
-    operator_row = operator_row.ljust(max_len)
-    
-    separator_cols = set()
-    for col in range(max_len):
-        if all(number_rows[i][col] == ' ' for i in range(len(number_rows))) and operator_row[col] == ' ':
-            separator_cols.add(col)
+    numbers = []
+    operation = None
     
-    problems = []
-    col = max_len - 1
-    
-    while col >= 0:
-        while col >= 0 and col in separator_cols:
-            col -= 1
-        
-        if col < 0:
-            break
-        
-        problem_cols = []
-        while col >= 0 and col not in separator_cols:
-            problem_cols.append(col)
-            col -= 1
-        
-        problem_cols.reverse()
+    # walk the transposed worksheet once; a blank column closes the current problem
+    for column in map(bytes, zip(*rows)):
+        if column == blank:
+            if numbers and operation:
+                yield numbers, operation
+            numbers = []
+            operation = None
+            continue
         
-        numbers = []
-        operation = None
+        digits = column[:-1].translate(None, NON_DIGITS)
+        if digits:
+            numbers.append(int(digits))
         
-        for col_idx in problem_cols:
-            num_str = ""
-            for row_idx in range(len(number_rows)):
-                if number_rows[row_idx][col_idx].isdigit():
-                    num_str += number_rows[row_idx][col_idx]
-            
-            if num_str:
-                numbers.append(int(num_str))
-            
-            if operator_row[col_idx] in ['+', '*']:
-                if not operation:
-                    operation = operator_row[col_idx]
-        
-        if numbers and operation:
-            problems.append({'numbers': numbers, 'operation': operation})
+        op = column[-1:]
+        if op in (b'+', b'*') and not operation:
+            operation = op.decode()
     
+    if numbers and operation:
+        yield numbers, operation
+
+
+def solve_math_worksheet(filename):
     grand_total = 0
-    
-    for problem in problems:
-        numbers = problem['numbers']
-        operation = problem['operation']
-        
-        result = numbers[0]
-        for num in numbers[1:]:
-            if operation == '+':
-                result += num
-            elif operation == '*':
-                result *= num
+    for numbers, operation in iter_problems(filename):
+        grand_total += evaluate_problem(numbers, operation)
+    return grand_total
+
+
+def _evaluate_packed(problem):
+    return evaluate_problem(*problem)
+
+
+def solve_math_worksheet_parallel(filename, workers=None, chunksize=16):
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return sum(pool.map(_evaluate_packed, iter_problems(filename), chunksize=chunksize))
+
+
+def write_synthetic_worksheet(path, problems, operands, digits=4, seed=0):
+    rng = random.Random(seed)
+    height = digits
+    rows = [[] for _ in range(height + 1)]
+    for p in range(problems):
+        if p:
+            for row in rows:
+                row.append(' ')
+        for c in range(operands):
+            value = str(rng.randint(10 ** (digits - 1), 10**digits - 1))
+            for r in range(height):
+                rows[r].append(value[r])
+            rows[height].append('*' if c == 0 else ' ')
+    with open(path, 'w') as f:
+        f.write('\n'.join(''.join(row) for row in rows) + '\n')
+
+
+def benchmark(problems=8, operands=20000):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'worksheet.txt')
+        write_synthetic_worksheet(path, problems, operands)
         
-        grand_total += result
+        t0 = time.perf_counter()
+        expected = sum(evaluate_problem_sequential(n, op) for n, op in iter_problems(path))
+        t1 = time.perf_counter()
+        tree = solve_math_worksheet(path)
+        t2 = time.perf_counter()
+        parallel = solve_math_worksheet_parallel(path, chunksize=1)
+        t3 = time.perf_counter()
     
-    return grand_total
+    assert expected == tree == parallel
+    print(f"{problems} problems x {operands} operands")
+    print(f"  sequential fold: {t1 - t0:.3f}s")
+    print(f"  product tree:    {t2 - t1:.3f}s")
+    print(f"  parallel tree:   {t3 - t2:.3f}s")
 
 
 if __name__ == "__main__":
-    result = solve_math_worksheet("puzzle_input.txt")
+    if '--bench' in sys.argv:
+        benchmark()
+        sys.exit(0)
+    
+    if '--parallel' in sys.argv:
+        result = solve_math_worksheet_parallel("puzzle_input.txt")
+    else:
+        result = solve_math_worksheet("puzzle_input.txt")
     print(f"Grand total: {result}")
@@ -1,4 +1,6 @@
 from pathlib import Path
+from typing import Iterable, Iterator
+import sys
 
 
 def parse_grid(path: Path) -> list[str]:
@@ -49,8 +51,8 @@ def count_splits(grid: list[str]) -> int:
 				next_row_beams.add(col)
 
 		beams = next_row_beams
-			if not beams:
-				break
+		if not beams:
+			break
 
 	return splits
 
@@ -89,10 +91,108 @@ def count_timelines(grid: list[str]) -> int:
 	return exited
 
 
+def sweep_manifold(grid: list[str]) -> tuple[int, int]:
+	import numpy as np
+
+	width = len(grid[0])
+	start_row, start_col = find_start(grid)
+
+	# one padding column on each side collects beams leaving the manifold
+	counts = np.zeros(width + 2, dtype=np.int64)
+	counts[start_col + 1] = 1
+	splits = 0
+	exited = 0
+
+	for row in range(start_row, len(grid)):
+		caret = np.frombuffer(grid[row].encode(), dtype=np.uint8) == ord("^")
+		if np.any(caret[1:] & caret[:-1]):
+			raise ValueError(f"Adjacent splitters in row {row}")
+		inner = counts[1:-1]
+		hit = np.where(caret, inner, 0)
+		splits += int(np.count_nonzero(hit))
+		inner[caret] = 0
+		counts[:-2] += hit
+		counts[2:] += hit
+		exited += int(counts[0]) + int(counts[-1])
+		counts[0] = 0
+		counts[-1] = 0
+		# timeline counts double per split level; switch to exact ints before int64 overflows
+		if counts.dtype != object and int(counts.max()) > 1 << 61:
+			counts = counts.astype(object)
+
+	return splits, exited + sum(map(int, counts))
+
+
+def stream_manifold(lines: Iterable[str]) -> Iterator[tuple[int, int, int]]:
+	# yields (row, splits, timelines) as each row arrives; only the current
+	# row's beam counts are kept
+	width = None
+	current: dict[int, int] | None = None
+	splits = 0
+	exited = 0
+	row = -1
+
+	for row, line in enumerate(lines):
+		line = line.rstrip("\r\n")
+		if width is None:
+			width = len(line)
+		elif len(line) != width:
+			raise ValueError("All rows must have equal width")
+
+		if current is None:
+			col = line.find("S")
+			if col == -1:
+				continue
+			current = {col: 1}
+
+		next_row: dict[int, int] = {}
+		for col, cnt in current.items():
+			if line[col] != "^":
+				next_row[col] = next_row.get(col, 0) + cnt
+				continue
+			splits += 1
+			for ncol in (col - 1, col + 1):
+				if not 0 <= ncol < width:
+					exited += cnt
+				elif line[ncol] == "^":
+					raise ValueError(f"Adjacent splitters in row {row}")
+				else:
+					next_row[ncol] = next_row.get(ncol, 0) + cnt
+		current = next_row
+		yield row, splits, exited + sum(current.values())
+
+	if row == -1:
+		raise ValueError("Input grid is empty")
+	if current is None:
+		raise ValueError("No start position 'S' found")
+
+
+def stream_counts(stream: Iterable[str]) -> tuple[int, int]:
+	splits = timelines = 0
+	for _, splits, timelines in stream_manifold(stream):
+		pass
+	return splits, timelines
+
+
 def main() -> None:
+	if "--stream" in sys.argv:
+		idx = sys.argv.index("--stream")
+		source = sys.argv[idx + 1] if idx + 1 < len(sys.argv) else "-"
+		if source == "-":
+			part1, part2 = stream_counts(sys.stdin)
+		else:
+			with open(source) as fh:
+				part1, part2 = stream_counts(fh)
+		print(f"Part 1: {part1}")
+		print(f"Part 2: {part2}")
+		return
+
 	grid = parse_grid(Path(__file__).with_name("puzzle_input.txt"))
-	part1 = count_splits(grid)
-	part2 = count_timelines(grid)
+	if "--dense" in sys.argv:
+		part1, part2 = sweep_manifold(grid)
+	else:
+		part1 = count_splits(grid)
+		part2 = count_timelines(grid)
 	print(f"Part 1: {part1}")
 	print(f"Part 2: {part2}")
 
@@ -1,16 +1,32 @@
 import heapq
+import sys
+from array import array
+from bisect import bisect_left, insort
 from collections import defaultdict
+from itertools import chain, islice
+from math import isqrt
 
 class UnionFind:
     def __init__(self, n):
-        self.parent = list(range(n))
-        self.rank = [0] * n
-        self.size = [1] * n
+        self.parent = array('i', range(n))
+        self.size = array('i', [1]) * n
+        self.count = n
+        # number of components of each size, plus the distinct sizes in order
+        self.size_counts = {1: n} if n else {}
+        self.distinct_sizes = [1] if n else []
     
     def find(self, x):
-        if self.parent[x] != x:
-            self.parent[x] = self.find(self.parent[x])
-        return self.parent[x]
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+    
+    def _drop_size(self, s):
+        self.size_counts[s] -= 1
+        if not self.size_counts[s]:
+            del self.size_counts[s]
+            del self.distinct_sizes[bisect_left(self.distinct_sizes, s)]
     
     def union(self, x, y):
         root_x = self.find(x)
@@ -19,31 +35,217 @@ class UnionFind:
         if root_x == root_y:
             return False
         
-        if self.rank[root_x] < self.rank[root_y]:
-            self.parent[root_x] = root_y
-            self.size[root_y] += self.size[root_x]
-        elif self.rank[root_x] > self.rank[root_y]:
-            self.parent[root_y] = root_x
-            self.size[root_x] += self.size[root_y]
-        else:
-            self.parent[root_y] = root_x
-            self.size[root_x] += self.size[root_y]
-            self.rank[root_x] += 1
+        if self.size[root_x] < self.size[root_y]:
+            root_x, root_y = root_y, root_x
+        size_x, size_y = self.size[root_x], self.size[root_y]
+        self.parent[root_y] = root_x
+        self.size[root_x] = size_x + size_y
+        self.count -= 1
+        
+        self._drop_size(size_x)
+        self._drop_size(size_y)
+        merged = size_x + size_y
+        if merged not in self.size_counts:
+            self.size_counts[merged] = 0
+            insort(self.distinct_sizes, merged)
+        self.size_counts[merged] += 1
         
         return True
     
+    def union_many(self, xs, ys):
+        union = self.union
+        merged = 0
+        for x, y in zip(xs, ys):
+            if union(int(x), int(y)):
+                merged += 1
+        return merged
+    
+    def top_sizes(self, k):
+        result = []
+        for s in reversed(self.distinct_sizes):
+            take = min(self.size_counts[s], k - len(result))
+            result.extend([s] * take)
+            if len(result) >= k:
+                break
+        return result
+    
     def get_component_sizes(self):
-        component_sizes = {}
-        for i in range(len(self.parent)):
-            root = self.find(i)
-            if root not in component_sizes:
-                component_sizes[root] = self.size[root]
-        return list(component_sizes.values())
+        return self.top_sizes(self.count)
 
 def distance(p1, p2):
     return ((p1[0] - p2[0])**2 + (p1[1] - p2[1])**2 + (p1[2] - p2[2])**2)**0.5
 
-def solve():
+def heap_pair_stream(distances):
+    while distances:
+        yield heapq.heappop(distances)
+
+NEIGHBOUR_CELLS = [(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)]
+
+def _collect_shell(boxes, low_d2, high_d2, budget=None):
+    # pairs with low_d2 < d2 <= high_d2, or None once more than budget are found
+    cell = isqrt(high_d2) + 1
+    grid = defaultdict(list)
+    for idx, (x, y, z) in enumerate(boxes):
+        grid[(x // cell, y // cell, z // cell)].append(idx)
+
+    shell = []
+    for (cx, cy, cz), members in grid.items():
+        for dx, dy, dz in NEIGHBOUR_CELLS:
+            others = grid.get((cx + dx, cy + dy, cz + dz))
+            if not others:
+                continue
+            for i in members:
+                x1, y1, z1 = boxes[i]
+                for j in others:
+                    if j <= i:
+                        continue
+                    x2, y2, z2 = boxes[j]
+                    d2 = (x1 - x2) ** 2 + (y1 - y2) ** 2 + (z1 - z2) ** 2
+                    if low_d2 < d2 <= high_d2:
+                        shell.append((d2, i, j))
+                        if budget is not None and len(shell) > budget:
+                            return None
+    return shell
+
+def grid_pair_stream(boxes, min_budget=4096):
+    n = len(boxes)
+    if n < 2:
+        return
+    lo = [min(b[k] for b in boxes) for k in range(3)]
+    hi = [max(b[k] for b in boxes) for k in range(3)]
+    max_d2 = sum((hi[k] - lo[k]) ** 2 for k in range(3))
+    volume = 1
+    for k in range(3):
+        volume *= max(hi[k] - lo[k], 1)
+    # first guess from the average spacing; the shell budget corrects it for
+    # clustered data
+    limit = max(int((volume / n) ** (2 / 3)), 1)
+    prev_d2 = -1
+    produced = 0
+
+    while prev_d2 < max_d2:
+        limit = min(max(limit, prev_d2 + 1), max_d2)
+        # a shell may hold about as many pairs as have been consumed so far;
+        # when it would hold more, narrow the shell and retry
+        budget = max(min_budget, produced)
+        shell = _collect_shell(boxes, prev_d2, limit, budget)
+        if shell is None:
+            if limit > prev_d2 + 1:
+                limit = prev_d2 + max((limit - prev_d2) // 4, 1)
+                continue
+            # a single distance value shared by more pairs than the budget
+            shell = _collect_shell(boxes, prev_d2, limit)
+
+        shell.sort()
+        for d2, i, j in shell:
+            yield d2 ** 0.5, i, j
+        produced += len(shell)
+        prev_d2 = limit
+        if len(shell) < budget // 8:
+            limit *= 4
+        else:
+            limit = int(limit * 2 ** (2 / 3))
+
+def top_k_pairs(boxes, k=1000, tile=1024):
+    import numpy as np
+
+    coords = np.asarray(boxes, dtype=np.int64).reshape(-1, 3)
+    n = len(coords)
+    cand_d = np.empty(0, dtype=np.int64)
+    cand_i = np.empty(0, dtype=np.int64)
+    cand_j = np.empty(0, dtype=np.int64)
+
+    for a in range(0, n, tile):
+        block_a = coords[a:a + tile]
+        for b in range(a, n, tile):
+            block_b = coords[b:b + tile]
+            diff = block_a[:, None, :] - block_b[None, :, :]
+            d2 = np.einsum('ijk,ijk->ij', diff, diff)
+            if len(cand_d) >= k:
+                valid = d2 <= cand_d.max()
+            else:
+                valid = np.ones(d2.shape, dtype=bool)
+            if a == b:
+                valid = np.triu(valid, 1)
+            ii, jj = np.nonzero(valid)
+            if not len(ii):
+                continue
+            dd = d2[ii, jj]
+
+            cand_d = np.concatenate([cand_d, dd])
+            cand_i = np.concatenate([cand_i, ii + a])
+            cand_j = np.concatenate([cand_j, jj + b])
+            if len(cand_d) > k:
+                # keep every entry tied with the k-th distance so the final
+                # (dist, i, j) ordering matches the heap
+                kth = np.partition(cand_d, k - 1)[k - 1]
+                keep = np.flatnonzero(cand_d <= kth)
+                cand_d, cand_i, cand_j = cand_d[keep], cand_i[keep], cand_j[keep]
+
+    order = np.lexsort((cand_j, cand_i, cand_d))[:k]
+    return [(int(cand_d[x]), int(cand_i[x]), int(cand_j[x])) for x in order]
+
+def prim_last_edge(boxes, break_ties=True):
+    import numpy as np
+
+    coords = np.asarray(boxes, dtype=np.int64).reshape(-1, 3)
+    n = len(coords)
+    if n < 2:
+        return None
+
+    # columns of the boxes not yet in the tree; a reached box is swapped to the
+    # end and the live prefix shrinks by one
+    xs, ys, zs = (coords[:, k].copy() for k in range(3))
+    ids = np.arange(n)
+    best = np.full(n, np.iinfo(np.int64).max, dtype=np.int64)
+    parent = np.zeros(n, dtype=np.int64)
+    live = [xs, ys, zs, ids, best, parent]
+    edges = []
+
+    def take(k, m):
+        for arr in live:
+            arr[k], arr[m - 1] = arr[m - 1], arr[k]
+
+    u = 0
+    take(0, n)
+    for m in range(n - 1, 0, -1):
+        ux, uy, uz = coords[u]
+        d2 = (xs[:m] - ux) ** 2
+        d2 += (ys[:m] - uy) ** 2
+        d2 += (zs[:m] - uz) ** 2
+        closer = d2 < best[:m]
+        best[:m][closer] = d2[closer]
+        parent[:m][closer] = u
+        k = int(np.argmin(best[:m]))
+        v = int(ids[k])
+        a, b = sorted((int(parent[k]), v))
+        edges.append((int(best[k]), a, b))
+        take(k, m)
+        u = v
+
+    longest = max(edges)
+    if not break_ties:
+        return longest
+
+    # With equal distances the MST is not unique. Replay the heap order over
+    # the longest-edge weight between the components formed by shorter edges.
+    top = longest[0]
+    uf = UnionFind(n)
+    for d2, a, b in edges:
+        if d2 < top:
+            uf.union(a, b)
+    last = longest
+    xs, ys, zs = (coords[:, k].copy() for k in range(3))
+    for i in range(n - 1):
+        d2 = (xs[i + 1:] - xs[i]) ** 2
+        d2 += (ys[i + 1:] - ys[i]) ** 2
+        d2 += (zs[i + 1:] - zs[i]) ** 2
+        for j in np.flatnonzero(d2 == top) + i + 1:
+            if uf.union(i, int(j)):
+                last = (top, i, int(j))
+    return last
+
+def solve(mode='heap'):
     with open('puzzle_input.txt', 'r') as f:
         lines = f.read().strip().split('\n')
 
@@ -55,13 +257,21 @@ def solve():
     n = len(boxes)
     print(f"Number of junction boxes: {n}")
 
-    distances = []
-    for i in range(n):
-        for j in range(i + 1, n):
-            dist = distance(boxes[i], boxes[j])
-            heapq.heappush(distances, (dist, i, j))
+    if mode == 'grid':
+        pairs = grid_pair_stream(boxes)
+    elif mode in ('topk', 'prim'):
+        # part 1 only needs the first 1000 pairs; part 2 continues on the grid stream
+        closest = [(d2 ** 0.5, i, j) for d2, i, j in top_k_pairs(boxes, 1000)]
+        pairs = chain(closest, islice(grid_pair_stream(boxes), len(closest), None))
+    else:
+        distances = []
+        for i in range(n):
+            for j in range(i + 1, n):
+                dist = distance(boxes[i], boxes[j])
+                heapq.heappush(distances, (dist, i, j))
 
-    print(f"Total pairs: {len(distances)}")
+        print(f"Total pairs: {len(distances)}")
+        pairs = heap_pair_stream(distances)
 
     uf = UnionFind(n)
 
@@ -69,8 +279,11 @@ def solve():
     pairs_needed = 1000
     actual_connections = 0
 
-    while pairs_processed < pairs_needed and distances:
-        dist, i, j = heapq.heappop(distances)
+    while pairs_processed < pairs_needed:
+        pair = next(pairs, None)
+        if pair is None:
+            break
+        dist, i, j = pair
         pairs_processed += 1
         if uf.union(i, j):
             actual_connections += 1
@@ -83,28 +296,36 @@ def solve():
     print(f"\nPart 1 - Pairs processed: {pairs_processed}")
     print(f"Part 1 - Actual connections made: {actual_connections}")
 
-    component_sizes = uf.get_component_sizes()
-    component_sizes.sort(reverse=True)
+    component_sizes = uf.top_sizes(10)
 
-    print(f"\nPart 1 - Number of circuits: {len(component_sizes)}")
-    print(f"Part 1 - Top 10 circuit sizes: {component_sizes[:10]}")
+    print(f"\nPart 1 - Number of circuits: {uf.count}")
+    print(f"Part 1 - Top 10 circuit sizes: {component_sizes}")
 
     if len(component_sizes) >= 3:
         result_part1 = component_sizes[0] * component_sizes[1] * component_sizes[2]
         print(f"\nPart 1 Answer: {component_sizes[0]} × {component_sizes[1]} × {component_sizes[2]} = {result_part1}")
     else:
-        print(f"\nNot enough circuits! Only {len(component_sizes)} circuits found.")
+        print(f"\nNot enough circuits! Only {uf.count} circuits found.")
         result_part1 = None
 
     print(f"\n{'='*60}")
     print("PART 2: Connecting until all boxes form a single circuit")
     print(f"{'='*60}\n")
 
-    num_circuits = len(component_sizes)
+    num_circuits = uf.count
     last_connection = None
 
-    while num_circuits > 1 and distances:
-        dist, i, j = heapq.heappop(distances)
+    if mode == 'prim' and num_circuits > 1:
+        # the final joining pair is the longest edge of the minimum spanning tree
+        d2, i, j = prim_last_edge(boxes)
+        last_connection = (i, j, d2 ** 0.5)
+        num_circuits = 1
+
+    while num_circuits > 1:
+        pair = next(pairs, None)
+        if pair is None:
+            break
+        dist, i, j = pair
         pairs_processed += 1
         if uf.union(i, j):
             actual_connections += 1
@@ -133,4 +354,8 @@ def solve():
 
 
 if __name__ == "__main__":
-    answer = solve()
+    mode = 'heap'
+    for flag in ('grid', 'topk', 'prim'):
+        if f'--{flag}' in sys.argv:
+            mode = flag
+    answer = solve(mode)
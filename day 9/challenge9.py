@@ -1,5 +1,10 @@
 #!/usr/bin/env python3
-from shapely.geometry import Polygon, box
+import os
+import subprocess
+import sys
+import time
+
+from rectilinear import RectilinearPolygon
 
 def read_input(filename):
     coordinates = []
@@ -12,6 +17,8 @@ def read_input(filename):
     return coordinates
 
 def find_largest_rectangle(red_tiles):
+    from shapely.geometry import Polygon, box
+
     polygon = Polygon(red_tiles)
     n = len(red_tiles)
     max_area = 0
@@ -38,9 +45,167 @@ def find_largest_rectangle(red_tiles):
     
     return max_area
 
+def build_containment_table(red_tiles):
+    import numpy as np
+
+    xs = sorted({x for x, _ in red_tiles})
+    ys = sorted({y for _, y in red_tiles})
+    x_index = {x: k for k, x in enumerate(xs)}
+    y_index = {y: k for k, y in enumerate(ys)}
+    nx, ny = len(xs), len(ys)
+
+    # elementary grid: even indices are the compressed coordinate lines, odd
+    # indices the open gaps between them
+    inside = np.zeros((2 * nx - 1, 2 * ny - 1), dtype=bool)
+    crossings = np.zeros((nx, max(ny - 1, 0)), dtype=np.int8)
+    n = len(red_tiles)
+    for k in range(n):
+        (x1, y1), (x2, y2) = red_tiles[k], red_tiles[(k + 1) % n]
+        a, b = sorted((x_index[x1], x_index[x2]))
+        c, d = sorted((y_index[y1], y_index[y2]))
+        if a != b and c != d:
+            raise ValueError("Polygon edges must be axis-aligned")
+        inside[2 * a:2 * b + 1, 2 * c:2 * d + 1] = True
+        if a == b:
+            crossings[a, c:d] ^= 1
+
+    # a gap cell is inside when an odd number of vertical edges lie to its left
+    cells = np.zeros((nx + 1, ny + 1), dtype=bool)
+    cells[1:nx, 1:ny] = (np.cumsum(crossings, axis=0)[:nx - 1] % 2).astype(bool)
+    inside[1::2, 1::2] |= cells[1:nx, 1:ny]
+    inside[0::2, 1::2] |= cells[:nx, 1:ny] | cells[1:, 1:ny]
+    inside[1::2, 0::2] |= cells[1:nx, :ny] | cells[1:nx, 1:]
+    inside[0::2, 0::2] |= cells[:nx, :ny] | cells[1:, :ny] | cells[:nx, 1:] | cells[1:, 1:]
+
+    outside = np.zeros((2 * nx, 2 * ny), dtype=np.int64)
+    outside[1:, 1:] = np.cumsum(np.cumsum(~inside, axis=0), axis=1)
+    return x_index, y_index, outside
+
+
+def candidate_order(red_tiles):
+    import numpy as np
+
+    # every corner pair with its area, plus the order from largest area down
+    px = np.array([x for x, _ in red_tiles], dtype=np.int64)
+    py = np.array([y for _, y in red_tiles], dtype=np.int64)
+    first, second = np.triu_indices(len(red_tiles), 1)
+    areas = (np.abs(px[first] - px[second]) + 1) * (np.abs(py[first] - py[second]) + 1)
+    return first, second, areas, np.argsort(-areas)
+
+def find_largest_rectangle_compressed(red_tiles, batch=4096):
+    import numpy as np
+
+    n = len(red_tiles)
+    if n < 2:
+        return 0
+    x_index, y_index, outside = build_containment_table(red_tiles)
+    ix = 2 * np.array([x_index[x] for x, _ in red_tiles], dtype=np.int64)
+    iy = 2 * np.array([y_index[y] for _, y in red_tiles], dtype=np.int64)
+    first, second, areas, order = candidate_order(red_tiles)
+
+    # scan candidates from the largest area down, in growing batches, and stop
+    # at the first rectangle with no outside cells
+    lo = 0
+    while lo < order.size:
+        sel = order[lo:lo + batch]
+        lo += batch
+        i, j = first[sel], second[sel]
+        a, b = np.minimum(ix[i], ix[j]), np.maximum(ix[i], ix[j]) + 1
+        c, d = np.minimum(iy[i], iy[j]), np.maximum(iy[i], iy[j]) + 1
+        bad = outside[b, d] - outside[a, d] - outside[b, c] + outside[a, c]
+        hits = np.flatnonzero(bad == 0)
+        if hits.size:
+            return int(areas[sel[hits[0]]])
+        batch *= 4
+    return 0
+
+def find_largest_rectangle_batched(red_tiles, batch=4096):
+    import numpy as np
+    import shapely
+    from shapely.geometry import Polygon
+
+    polygon = Polygon(red_tiles)
+    shapely.prepare(polygon)
+    px = np.array([x for x, _ in red_tiles], dtype=np.int64)
+    py = np.array([y for _, y in red_tiles], dtype=np.int64)
+    first, second, areas, order = candidate_order(red_tiles)
+
+    for lo in range(0, len(order), batch):
+        sel = order[lo:lo + batch]
+        i, j = first[sel], second[sel]
+        rects = shapely.box(np.minimum(px[i], px[j]), np.minimum(py[i], py[j]),
+                            np.maximum(px[i], px[j]), np.maximum(py[i], py[j]))
+        hits = np.flatnonzero(shapely.covers(polygon, rects))
+        if hits.size:
+            return int(areas[sel[hits[0]]])
+    return 0
+
+def rectilinear_backend(red_tiles):
+    return RectilinearPolygon(red_tiles).contains_rectangle
+
+def shapely_backend(red_tiles):
+    import shapely
+    from shapely.geometry import Polygon, box
+
+    polygon = Polygon(red_tiles)
+    shapely.prepare(polygon)
+    return lambda x1, y1, x2, y2: polygon.covers(box(min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)))
+
+def find_largest_rectangle_sorted(red_tiles, backend=rectilinear_backend):
+    # largest area first, one containment test per candidate; the backend
+    # only decides how a rectangle is tested against the polygon
+    if len(red_tiles) < 2:
+        return 0
+    contains = backend(red_tiles)
+    first, second, areas, order = candidate_order(red_tiles)
+    for k in order:
+        (x1, y1), (x2, y2) = red_tiles[first[k]], red_tiles[second[k]]
+        if contains(x1, y1, x2, y2):
+            return int(areas[k])
+    return 0
+
+def find_largest_rectangle_rectilinear(red_tiles):
+    return find_largest_rectangle_sorted(red_tiles, rectilinear_backend)
+
+def startup_benchmark(runs=5):
+    # same sorted search, only the polygon backend differs: wall time from
+    # interpreter launch through imports to the printed answer
+    modes = (('rectilinear', []), ('shapely', ['--shapely-scan']))
+    imports = (('rectilinear', 'import numpy, rectilinear'), ('shapely', 'import numpy, shapely.geometry'))
+    for label, flag in modes:
+        times = []
+        for _ in range(runs):
+            t0 = time.perf_counter()
+            subprocess.run([sys.executable, __file__] + flag, check=True, stdout=subprocess.DEVNULL)
+            times.append(time.perf_counter() - t0)
+        print(f"{label:12s} launch to answer  best {min(times):.3f}s  mean {sum(times) / runs:.3f}s")
+    for label, code in imports:
+        times = []
+        for _ in range(runs):
+            t0 = time.perf_counter()
+            subprocess.run([sys.executable, '-c', code], check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+            times.append(time.perf_counter() - t0)
+        print(f"{label:12s} launch to import  best {min(times):.3f}s  ({code!r})")
+
 def main():
+    if '--bench-startup' in sys.argv:
+        startup_benchmark()
+        return
     red_tiles = read_input('puzzle_input.txt')
-    largest_area = find_largest_rectangle(red_tiles)
+    if '--compressed' in sys.argv:
+        largest_area = find_largest_rectangle_compressed(red_tiles)
+    elif '--batched' in sys.argv:
+        largest_area = find_largest_rectangle_batched(red_tiles)
+    elif '--shapely-scan' in sys.argv:
+        largest_area = find_largest_rectangle_sorted(red_tiles, shapely_backend)
+    elif '--shapely' in sys.argv:
+        largest_area = find_largest_rectangle(red_tiles)
+    else:
+        largest_area = find_largest_rectangle_rectilinear(red_tiles)
+        if '--validate' in sys.argv:
+            expected = find_largest_rectangle(red_tiles)
+            if expected != largest_area:
+                raise AssertionError(f"rectilinear {largest_area} != shapely {expected}")
     print(largest_area)
 
 if __name__ == "__main__":
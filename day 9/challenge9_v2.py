@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
-from shapely.geometry import Polygon, Point, box
+import sys
+
+from rectilinear import RectilinearPolygon
 
 def read_input(filename):
     coordinates = []
@@ -12,6 +14,8 @@ def read_input(filename):
     return coordinates
 
 def find_largest_rectangle(red_tiles):
+    from shapely.geometry import Polygon, box
+
     polygon = Polygon(red_tiles)
     print(f"Polygon area: {polygon.area}")
     print(f"Polygon is valid: {polygon.is_valid}")
@@ -47,10 +51,82 @@ def find_largest_rectangle(red_tiles):
     print(f"Total checked: {checked}, invalid: {invalid}")
     return max_area
 
+def find_largest_rectangle_rectilinear(red_tiles):
+    polygon = RectilinearPolygon(red_tiles)
+    n = len(red_tiles)
+    max_area = 0
+    best_rect = None
+    checked = 0
+    invalid = 0
+    for i in range(n):
+        if i % 50 == 0:
+            print(f"Progress: {i}/{n}, checked: {checked}, invalid: {invalid}, max: {max_area}")
+        x1, y1 = red_tiles[i]
+        for j in range(i + 1, n):
+            x2, y2 = red_tiles[j]
+            area = (abs(x2 - x1) + 1) * (abs(y2 - y1) + 1)
+            if area <= max_area:
+                continue
+            checked += 1
+            if polygon.contains_rectangle(x1, y1, x2, y2):
+                max_area = area
+                best_rect = ((x1, y1), (x2, y2))
+                print(f"New best: {area} at {best_rect}")
+            else:
+                invalid += 1
+    if best_rect:
+        print(f"Best rectangle: {best_rect[0]} to {best_rect[1]}")
+    print(f"Total checked: {checked}, invalid: {invalid}")
+    return max_area
+
+def find_largest_rectangle_batched(red_tiles, batch=4096):
+    import numpy as np
+    import shapely
+    from shapely.geometry import Polygon
+
+    polygon = Polygon(red_tiles)
+    shapely.prepare(polygon)
+    n = len(red_tiles)
+    px = np.array([x for x, _ in red_tiles], dtype=np.int64)
+    py = np.array([y for _, y in red_tiles], dtype=np.int64)
+    first, second = np.triu_indices(n, 1)
+    areas = (np.abs(px[first] - px[second]) + 1) * (np.abs(py[first] - py[second]) + 1)
+    order = np.argsort(-areas)
+    print(f"Candidate pairs: {len(order)}")
+
+    max_area = 0
+    best_rect = None
+    checked = 0
+    invalid = 0
+    for lo in range(0, len(order), batch):
+        sel = order[lo:lo + batch]
+        i, j = first[sel], second[sel]
+        rects = shapely.box(np.minimum(px[i], px[j]), np.minimum(py[i], py[j]),
+                            np.maximum(px[i], px[j]), np.maximum(py[i], py[j]))
+        # covers() already includes every rectangle contains() accepts
+        inside = shapely.covers(polygon, rects)
+        checked += len(sel)
+        invalid += int(len(sel) - inside.sum())
+        hits = np.flatnonzero(inside)
+        if hits.size:
+            k = sel[hits[0]]
+            max_area = int(areas[k])
+            best_rect = (red_tiles[first[k]], red_tiles[second[k]])
+            break
+    if best_rect:
+        print(f"Best rectangle: {best_rect[0]} to {best_rect[1]}")
+    print(f"Total checked: {checked}, invalid: {invalid}, skipped: {len(order) - checked}")
+    return max_area
+
 def main():
     red_tiles = read_input('puzzle_input.txt')
     print(f"Number of red tiles: {len(red_tiles)}")
-    largest_area = find_largest_rectangle(red_tiles)
+    if '--batched' in sys.argv:
+        largest_area = find_largest_rectangle_batched(red_tiles)
+    elif '--shapely' in sys.argv:
+        largest_area = find_largest_rectangle(red_tiles)
+    else:
+        largest_area = find_largest_rectangle_rectilinear(red_tiles)
     print(f"Largest rectangle area: {largest_area}")
 
 if __name__ == "__main__":
@@ -0,0 +1,74 @@
+from bisect import bisect_left, bisect_right
+
+
+class RectilinearPolygon:
+    def __init__(self, vertices):
+        n = len(vertices)
+        self.edges = []
+        for k in range(n):
+            (x1, y1), (x2, y2) = vertices[k], vertices[(k + 1) % n]
+            if x1 != x2 and y1 != y2:
+                raise ValueError(f"Edge {(x1, y1)} -> {(x2, y2)} is not axis-aligned")
+            self.edges.append((min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)))
+
+        # horizontal edges sorted by y and vertical edges sorted by x, so a
+        # query only looks at edges inside its band
+        self.horizontal = sorted((e for e in self.edges if e[1] == e[3]), key=lambda e: e[1])
+        self.vertical = sorted((e for e in self.edges if e[1] != e[3]), key=lambda e: e[0])
+        self.h_keys = [e[1] for e in self.horizontal]
+        self.v_keys = [e[0] for e in self.vertical]
+
+    def on_boundary(self, x, y):
+        lo, hi = bisect_left(self.h_keys, y), bisect_right(self.h_keys, y)
+        for ex1, _, ex2, _ in self.horizontal[lo:hi]:
+            if ex1 <= x <= ex2:
+                return True
+        lo, hi = bisect_left(self.v_keys, x), bisect_right(self.v_keys, x)
+        for _, ey1, _, ey2 in self.vertical[lo:hi]:
+            if ey1 <= y <= ey2:
+                return True
+        return False
+
+    def contains_point(self, x, y):
+        # closed test: points on an edge count as inside
+        if self.on_boundary(x, y):
+            return True
+        inside = False
+        for k in range(bisect_right(self.v_keys, x), len(self.vertical)):
+            _, ey1, _, ey2 = self.vertical[k]
+            if ey1 <= y < ey2:
+                inside = not inside
+        return inside
+
+    def crosses_open_rectangle(self, x1, y1, x2, y2):
+        horizontal, vertical = self.horizontal, self.vertical
+        for k in range(bisect_right(self.h_keys, y1), bisect_left(self.h_keys, y2)):
+            ex1, _, ex2, _ = horizontal[k]
+            if ex1 < x2 and x1 < ex2:
+                return True
+        for k in range(bisect_right(self.v_keys, x1), bisect_left(self.v_keys, x2)):
+            _, ey1, _, ey2 = vertical[k]
+            if ey1 < y2 and y1 < ey2:
+                return True
+        return False
+
+    def contains_rectangle(self, x1, y1, x2, y2):
+        # closed rectangle inside the closed polygon, like shapely's covers()
+        x1, x2 = min(x1, x2), max(x1, x2)
+        y1, y2 = min(y1, y2), max(y1, y2)
+
+        if x1 < x2 and y1 < y2:
+            # with no edge entering the open rectangle it is all inside or all out
+            if self.crosses_open_rectangle(x1, y1, x2, y2):
+                return False
+            return self.contains_point((x1 + x2) / 2, (y1 + y2) / 2)
+
+        # degenerate rectangle: cut the segment wherever an edge could start or
+        # stop touching it and test every cut and piece midpoint
+        if x1 == x2:
+            cuts = sorted({y1, y2} | {y for e in self.edges for y in (e[1], e[3]) if y1 < y < y2})
+            points = [(x1, y) for y in cuts] + [(x1, (a + b) / 2) for a, b in zip(cuts, cuts[1:])]
+        else:
+            cuts = sorted({x1, x2} | {x for e in self.edges for x in (e[0], e[2]) if x1 < x < x2})
+            points = [(x, y1) for x in cuts] + [((a + b) / 2, y1) for a, b in zip(cuts, cuts[1:])]
+        return all(self.contains_point(x, y) for x, y in points)